@@ -1,5 +1,4 @@
 from flask import Flask, request, jsonify
-from insightface.app import FaceAnalysis
 import mediapipe as mp
 from pydantic import BaseModel
 import os
@@ -12,6 +11,10 @@ import json
 import base64
 import re
 
+from Age_Height_Gender_Prediction.model_runtime import load_face_model
+from cpu_budget import thread_budget
+from pose_runtime import BudgetedPose
+
 app = Flask(__name__)
 
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
@@ -21,18 +24,22 @@ os.environ["MEDIAPIPE_DISABLE_GPU"] = "true"
 api_key = os.getenv("api_key")
 client = OpenAI(api_key=api_key)
 
-# activates FaceAnalysis
-model = FaceAnalysis()
-model.prepare(ctx_id=-1)
+# per-process thread budgets, so several gunicorn workers don't oversubscribe the cores
+ort_threads = thread_budget("ORT_NUM_THREADS")
+mediapipe_threads = thread_budget("MEDIAPIPE_NUM_THREADS")
+
+# activates FaceAnalysis (FACE_MODEL_PRECISION=int8 loads the quantized models)
+model = load_face_model(os.getenv("FACE_MODEL_PRECISION", "fp32"), ort_threads)
 
 # activates mediapipe
-pose = mp.solutions.pose.Pose(mp.solutions.pose.Pose(
+pose = BudgetedPose(
+    mediapipe_threads,
     static_image_mode=True,
     model_complexity=1,
     enable_segmentation=False,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5
-))
+)
 
 # landmark indices
 nose_pixels = mp.solutions.pose.PoseLandmark.NOSE.value
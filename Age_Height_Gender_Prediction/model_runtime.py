@@ -0,0 +1,85 @@
+import glob
+import os
+
+import onnx
+import onnxruntime as ort
+from insightface.app import FaceAnalysis
+from insightface.model_zoo import Attribute, RetinaFace
+from insightface.utils import DEFAULT_MP_NAME, ensure_available
+
+
+def int8_model_path(model_file):
+    folder, name = os.path.split(model_file)
+    return os.path.join(folder, "int8", name)
+
+
+def route_model(model_file):
+    """Returns the insightface model class for `model_file` from its graph, without building a session.
+
+    Only the detection and genderage models feed the /predict response, so
+    every other model in the pack gets None.
+    """
+    graph = onnx.load(model_file).graph
+    weights = {initializer.name for initializer in graph.initializer}
+    data_input = next(value for value in graph.input if value.name not in weights)
+    input_shape = [dim.dim_value for dim in data_input.type.tensor_type.shape.dim]
+
+    # same rules as insightface's ModelRouter
+    if len(graph.output) >= 5:
+        return RetinaFace
+    if input_shape[2:4] == [96, 96]:
+        return Attribute
+    return None
+
+
+class CPUFaceAnalysis(FaceAnalysis):
+    """FaceAnalysis with one CPU ONNX Runtime session per model file, built with our own thread settings.
+
+    FaceAnalysis.__init__ would first open every model with ONNX Runtime's
+    default options, i.e. a thread pool the size of the machine, so it is not
+    called here. With precision="int8" the dynamically quantized copies written
+    by quantize_face_models.py are loaded instead of the FP32 files.
+    """
+
+    def __init__(self, precision="fp32", num_threads=1, name=DEFAULT_MP_NAME, root="~/.insightface"):
+        if precision not in ("fp32", "int8"):
+            raise ValueError(f"precision must be 'fp32' or 'int8', got {precision!r}")
+
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.inter_op_num_threads = 1
+        options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+
+        self.models = {}
+        self.model_dir = ensure_available("models", name, root=root)
+        for model_file in sorted(glob.glob(os.path.join(self.model_dir, "*.onnx"))):
+            model_class = route_model(model_file)
+            if model_class is None:
+                continue
+
+            session_file = model_file
+            if precision == "int8":
+                session_file = int8_model_path(model_file)
+                if not os.path.exists(session_file):
+                    raise FileNotFoundError(
+                        f"INT8 model for {model_file} not found at {session_file}, run quantize_face_models.py first"
+                    )
+
+            session = ort.InferenceSession(session_file, sess_options=options, providers=["CPUExecutionProvider"])
+            # the FP32 file is passed as model_file so Attribute detects its input
+            # mean/std from the original graph; the INT8 graph keeps the same I/O
+            model = model_class(model_file=model_file, session=session)
+            if model.taskname not in self.models:
+                self.models[model.taskname] = model
+
+        for taskname in ("detection", "genderage"):
+            if taskname not in self.models:
+                raise RuntimeError(f"no {taskname} model found in {self.model_dir}")
+        self.det_model = self.models["detection"]
+
+
+def load_face_model(precision="fp32", num_threads=1):
+    """Loads the detection and genderage models on CPU with a fixed intra-op thread count."""
+    model = CPUFaceAnalysis(precision, num_threads)
+    model.prepare(ctx_id=-1)
+    return model
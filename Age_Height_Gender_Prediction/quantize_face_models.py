@@ -0,0 +1,122 @@
+"""
+Builds dynamically quantized INT8 copies of the FaceAnalysis detection and
+genderage models and reports how far their age/gender predictions drift from
+the FP32 models on a local image set.
+
+Usage (from the repo root):
+    python -m Age_Height_Gender_Prediction.quantize_face_models                 # quantize only
+    python -m Age_Height_Gender_Prediction.quantize_face_models images/         # quantize if needed, then compare
+    python -m Age_Height_Gender_Prediction.quantize_face_models images/ --force # re-quantize, then compare
+
+The INT8 files are written next to the FP32 ones in an int8/ folder, which is
+where body_measurements.py looks for them when FACE_MODEL_PRECISION=int8.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import cv2
+import numpy as np
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+from Age_Height_Gender_Prediction.model_runtime import int8_model_path, load_face_model
+from cpu_budget import thread_budget
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def quantize(model, force=False):
+    for taskname, face_model in model.models.items():
+        int8_file = int8_model_path(face_model.model_file)
+        if os.path.exists(int8_file) and not force:
+            print(f"✅ {taskname}: {int8_file} already exists")
+            continue
+
+        os.makedirs(os.path.dirname(int8_file), exist_ok=True)
+        # ConvInteger on CPU only has uint8 x uint8 kernels
+        quantize_dynamic(face_model.model_file, int8_file, weight_type=QuantType.QUInt8)
+        fp32_mb = os.path.getsize(face_model.model_file) / 1e6
+        int8_mb = os.path.getsize(int8_file) / 1e6
+        print(f"✅ {taskname}: {int8_file} ({fp32_mb:.1f} MB -> {int8_mb:.1f} MB)")
+
+
+def predict(model, image):
+    start = time.perf_counter()
+    faces = model.get(image)
+    elapsed = time.perf_counter() - start
+    if not faces:
+        return None, elapsed
+    # /predict uses the first detected face
+    return (int(faces[0].age), "female" if faces[0].gender == 0 else "male"), elapsed
+
+
+def compare(fp32_model, int8_model, image_dir):
+    paths = []
+    for root, _, names in os.walk(image_dir):
+        paths.extend(os.path.join(root, name) for name in sorted(names) if name.lower().endswith(IMAGE_EXTENSIONS))
+    if not paths:
+        print(f"❌ No {', '.join(IMAGE_EXTENSIONS)} images found in {image_dir}")
+        sys.exit(1)
+
+    age_drift = []
+    gender_flips = []
+    detection_mismatches = []
+    fp32_times = []
+    int8_times = []
+
+    for path in paths:
+        image = cv2.imread(path)
+        if image is None:
+            print(f"⚠️  Could not read {path}, skipping")
+            continue
+
+        fp32_result, fp32_time = predict(fp32_model, image)
+        int8_result, int8_time = predict(int8_model, image)
+        fp32_times.append(fp32_time)
+        int8_times.append(int8_time)
+
+        if (fp32_result is None) != (int8_result is None):
+            detection_mismatches.append(path)
+            continue
+        if fp32_result is None:
+            continue
+
+        age_drift.append(abs(fp32_result[0] - int8_result[0]))
+        if fp32_result[1] != int8_result[1]:
+            gender_flips.append(path)
+
+    print(f"\n{'─'*50}")
+    print(f"  Images compared      : {len(fp32_times)}")
+    print(f"  Faces in both        : {len(age_drift)}")
+    print(f"  Detection mismatches : {len(detection_mismatches)}")
+    if age_drift:
+        print(f"  Age drift (years)    : mean {np.mean(age_drift):.2f}, "
+              f"p95 {np.percentile(age_drift, 95):.1f}, max {max(age_drift)}")
+        print(f"  Gender agreement     : {100 * (1 - len(gender_flips) / len(age_drift)):.1f}% "
+              f"({len(gender_flips)} flipped)")
+    if fp32_times:
+        print(f"  Mean face inference  : FP32 {1000 * np.mean(fp32_times):.1f} ms, "
+              f"INT8 {1000 * np.mean(int8_times):.1f} ms")
+    print(f"{'─'*50}")
+
+    for path in detection_mismatches:
+        print(f"  detection mismatch: {path}")
+    for path in gender_flips:
+        print(f"  gender flipped    : {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quantize the face models to INT8 and compare them with FP32.")
+    parser.add_argument("images", nargs="?", help="folder of .jpg/.jpeg/.png images to compare on")
+    parser.add_argument("--force", action="store_true", help="re-quantize even if INT8 files exist")
+    args = parser.parse_args()
+
+    num_threads = thread_budget("ORT_NUM_THREADS")
+    fp32_model = load_face_model("fp32", num_threads)
+    quantize(fp32_model, force=args.force)
+
+    if args.images:
+        int8_model = load_face_model("int8", num_threads)
+        compare(fp32_model, int8_model, args.images)
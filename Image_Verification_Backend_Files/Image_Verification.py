@@ -9,6 +9,9 @@ from io import BytesIO
 import numpy as np
 import cv2
 
+from cpu_budget import thread_budget
+from pose_runtime import BudgetedPose
+
 
 
 app = Flask(__name__)
@@ -16,14 +19,16 @@ app = Flask(__name__)
 os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
 os.environ["MEDIAPIPE_DISABLE_GPU"] = "true"
 
-# activates the mediapipe
-pose = mp.solutions.pose.Pose(mp.solutions.pose.Pose(
+
+# activates the mediapipe with a per-process thread budget
+pose = BudgetedPose(
+    thread_budget("MEDIAPIPE_NUM_THREADS"),
     static_image_mode=True,
     model_complexity=1,
     enable_segmentation=False,
     min_detection_confidence=0.5,
     min_tracking_confidence=0.5
-))
+)
 
 # landmark indices
 nose_pixels = mp.solutions.pose.PoseLandmark.NOSE.value
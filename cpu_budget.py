@@ -0,0 +1,9 @@
+import os
+
+
+def thread_budget(env_name):
+    """Threads for one process: `env_name` if set, otherwise the cores split across gunicorn workers."""
+    if os.getenv(env_name):
+        return max(1, int(os.getenv(env_name)))
+    workers = max(1, int(os.getenv("WEB_CONCURRENCY", 1)))
+    return max(1, (os.cpu_count() or 1) // workers)
@@ -0,0 +1,24 @@
+import mediapipe as mp
+from mediapipe.framework.thread_pool_executor_pb2 import ThreadPoolExecutorOptions
+
+
+class BudgetedPose(mp.solutions.pose.Pose):
+    """MediaPipe Pose whose calculator graph runs on at most `num_threads` threads."""
+
+    def __init__(self, num_threads, **kwargs):
+        self._num_threads = num_threads
+        super().__init__(**kwargs)
+
+    def _initialize_graph_interface(self, *args, **kwargs):
+        graph_config = super()._initialize_graph_interface(*args, **kwargs)
+        # the pose .binarypb declares no executor, but graph validation adds an
+        # empty default one to the canonical config, and mediapipe rejects that
+        # together with the graph-level num_threads, so size that executor's pool
+        for executor in graph_config.executor:
+            if not executor.name:
+                executor.type = "ThreadPoolExecutor"
+                executor.options.Extensions[ThreadPoolExecutorOptions.ext].num_threads = self._num_threads
+                break
+        else:
+            graph_config.num_threads = self._num_threads
+        return graph_config
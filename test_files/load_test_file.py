@@ -0,0 +1,500 @@
+"""
+========================================
+  FitterGem — Load Test
+========================================
+
+Drives the /Verification and /predict endpoints with a closed-loop load
+generator and reports throughput, goodput (requests that got a non-5xx
+answer), latency percentiles, error rates and the saturation knee for every
+server configuration in the sweep. The knee is found from goodput, so fast
+failures don't make a configuration look like it is still scaling.
+
+For each combination of gunicorn workers and threads the script:
+  1. starts a stub OpenAI backend, so /predict never calls GPT-4o
+  2. starts the server under gunicorn on a free local port and waits until
+     every worker has loaded the app
+  3. warms it up, then runs every concurrency level for a fixed duration,
+     with each client sending its next request as soon as the last returns
+  4. stops the server and prints one table per endpoint and request mix
+
+BEFORE RUNNING:
+  1. Install the server requirements plus gunicorn and requests
+  2. Put test images in a folder. Sub-folders named "pass" and "fail" label
+     images that should pass or fail verification, e.g.
+       images/pass/standing.jpg
+       images/fail/selfie.heic
+  3. Run this script:
+       python test_files/load_test_file.py images/
+
+Example sweep:
+  python test_files/load_test_file.py images/ --endpoint both \\
+      --workers 1,2,4 --threads 1,2 --concurrency 1,2,4,8,16 \\
+      --mix all,jpeg,heic,pass,fail --duration 30 --json results.json
+
+Request mixes are "all" or "+"-joined labels that every image in the mix
+must carry: jpeg, heic, pass, fail, small, large (e.g. "jpeg+pass").
+Use --env KEY=VALUE to pass extra settings to the servers for every run.
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# endpoint name -> (gunicorn app, route); apps are imported from the repo root
+ENDPOINTS = {
+    "verification": ("Image_Verification_Backend_Files.Image_Verification:app", "/Verification"),
+    "predict": ("Age_Height_Gender_Prediction.body_measurements:app", "/predict"),
+}
+
+CONTENT_TYPES = {
+    "jpeg": "image/jpeg",
+    "heic": "image/heic",
+}
+
+# ─── COLORS FOR TERMINAL OUTPUT ───────────────────────────────────────────────
+GREEN  = "\033[92m"
+YELLOW = "\033[93m"
+RED    = "\033[91m"
+BLUE   = "\033[94m"
+CYAN   = "\033[96m"
+RESET  = "\033[0m"
+BOLD   = "\033[1m"
+
+def print_banner():
+    print(f"\n{BLUE}{BOLD}{'='*50}{RESET}")
+    print(f"{BLUE}{BOLD}   FitterGem — Load Test{RESET}")
+    print(f"{BLUE}{BOLD}{'='*50}{RESET}\n")
+
+
+# ─── STUB LLM BACKEND ─────────────────────────────────────────────────────────
+class StubLLMHandler(BaseHTTPRequestHandler):
+    """Answers every chat completion with a fixed height/weight reply."""
+
+    latency = 0.0
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        if self.latency:
+            time.sleep(self.latency)
+
+        body = json.dumps({
+            "id": "chatcmpl-loadtest",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "gpt-4o",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "{\"height_cm\": 175.0, \"weight_kg\": 70.0}"},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_stub_llm(latency):
+    handler = type("Handler", (StubLLMHandler,), {"latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# ─── SERVER UNDER TEST ────────────────────────────────────────────────────────
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+# gunicorn runs post_worker_init after a worker has imported the app, i.e. after
+# the models are loaded ("Booting worker" is logged before that happens)
+GUNICORN_HOOKS = """
+import os
+
+def post_worker_init(worker):
+    with open(os.environ["LOADTEST_READY_FILE"], "a") as file:
+        file.write(f"{worker.pid}\\n")
+"""
+
+def ready_workers(ready_file):
+    if not os.path.exists(ready_file):
+        return 0
+    with open(ready_file) as file:
+        return len(set(file.read().split()))
+
+def log_tail(log_file, lines=20):
+    if not os.path.exists(log_file):
+        return ""
+    with open(log_file, errors="replace") as file:
+        tail = file.read().splitlines()[-lines:]
+    return "\n".join(f"     | {line}" for line in tail)
+
+def start_server(endpoint, workers, threads, llm_url, extra_env, startup_timeout):
+    app, route = ENDPOINTS[endpoint]
+    port = free_port()
+
+    workdir = tempfile.mkdtemp(prefix="loadtest_")
+    config_file = os.path.join(workdir, "gunicorn_hooks.py")
+    ready_file = os.path.join(workdir, "ready")
+    log_file = os.path.join(workdir, "gunicorn.log")
+    with open(config_file, "w") as file:
+        file.write(GUNICORN_HOOKS)
+
+    env = dict(os.environ)
+    env.update({
+        "OPENAI_BASE_URL": llm_url,
+        "api_key": env.get("api_key", "loadtest"),
+        "WEB_CONCURRENCY": str(workers),
+        "LOADTEST_READY_FILE": ready_file,
+    })
+    env.update(extra_env)
+
+    # gunicorn's own output is the only place import errors in a worker show up
+    with open(log_file, "w") as log:
+        process = subprocess.Popen(
+            [
+                sys.executable, "-m", "gunicorn",
+                "--config", config_file,
+                "--chdir", REPO_ROOT,
+                "--workers", str(workers),
+                "--threads", str(threads),
+                "--bind", f"127.0.0.1:{port}",
+                "--timeout", "300",
+                app,
+            ],
+            env=env,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+
+    # wait until every worker has loaded the app, not just the first one
+    url = f"http://127.0.0.1:{port}{route}"
+    deadline = time.time() + startup_timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            tail = log_tail(log_file)
+            shutil.rmtree(workdir, ignore_errors=True)
+            raise RuntimeError(f"gunicorn exited with code {process.returncode} while starting {app}\n{tail}")
+        if ready_workers(ready_file) >= workers:
+            return process, url, workdir
+        time.sleep(0.5)
+
+    started = ready_workers(ready_file)
+    tail = log_tail(log_file)
+    stop_server(process, workdir)
+    raise RuntimeError(f"only {started} of {workers} {app} workers started within {startup_timeout}s\n{tail}")
+
+def stop_server(process, workdir):
+    if process.poll() is None:
+        os.killpg(process.pid, signal.SIGTERM)
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+            process.wait()
+    shutil.rmtree(workdir, ignore_errors=True)
+
+
+# ─── REQUEST MIXES ────────────────────────────────────────────────────────────
+def load_images(folder, large_kb):
+    images = []
+    for root, _, names in os.walk(folder):
+        for name in sorted(names):
+            ext = os.path.splitext(name)[1].lower()
+            if ext in (".jpg", ".jpeg"):
+                image_format = "jpeg"
+            elif ext in (".heic", ".heif"):
+                image_format = "heic"
+            else:
+                continue
+
+            path = os.path.join(root, name)
+            with open(path, "rb") as file:
+                data = file.read()
+
+            labels = {image_format, "large" if len(data) >= large_kb * 1024 else "small"}
+            parts = os.path.relpath(path, folder).lower().split(os.sep)
+            if "pass" in parts:
+                labels.add("pass")
+            elif "fail" in parts:
+                labels.add("fail")
+
+            images.append({
+                "name": name,
+                "data": data,
+                "content_type": CONTENT_TYPES[image_format],
+                "labels": labels,
+            })
+    return images
+
+def select_mix(images, mix):
+    if mix == "all":
+        return images
+    wanted = set(mix.split("+"))
+    return [image for image in images if wanted <= image["labels"]]
+
+
+# ─── CLOSED-LOOP LOAD GENERATOR ───────────────────────────────────────────────
+def send_request(session, url, endpoint, image, user_id, timeout):
+    data = {"user_id": user_id} if endpoint == "predict" else None
+    start = time.perf_counter()
+    try:
+        response = session.post(
+            url,
+            files={"image": (image["name"], image["data"], image["content_type"])},
+            data=data,
+            timeout=timeout,
+        )
+    except requests.exceptions.RequestException:
+        return time.perf_counter() - start, None, None
+    latency = time.perf_counter() - start
+
+    try:
+        app_status = response.json().get("status")
+    except ValueError:
+        app_status = None
+    return latency, response.status_code, app_status
+
+def run_level(url, endpoint, images, concurrency, duration, timeout, seed):
+    """Runs `concurrency` clients back to back for `duration` seconds."""
+    samples = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def client(client_id):
+        rng = random.Random(seed + client_id)
+        session = requests.Session()
+        local = []
+        # /predict writes uploads to /tmp/<user_id>_upload.jpg and leaves it behind on
+        # failures; each client sends one request at a time, so a per-client id never
+        # collides and keeps the sweep to one file per client
+        user_id = f"loadtest_{client_id}"
+        while time.perf_counter() < stop_at:
+            image = rng.choice(images)
+            local.append(send_request(session, url, endpoint, image, user_id, timeout))
+        session.close()
+        with lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client, args=(i,)) for i in range(concurrency)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    return summarize(samples, elapsed, concurrency)
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return None
+    rank = max(1, int(round(pct / 100 * len(sorted_values))))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples, elapsed, concurrency):
+    # fast 5xx and connection failures would drag the percentiles down, so they
+    # only cover requests that got a non-5xx answer
+    latencies = sorted(latency for latency, code, _ in samples if code is not None and code < 500)
+    errors = sum(1 for _, code, _ in samples if code is None or code >= 500)
+    rejected = sum(1 for _, code, app_status in samples
+                   if code is not None and code < 500 and (code >= 400 or app_status == "error"))
+    total = len(samples)
+
+    # fast 5xx and connection failures inflate req/s, so the knee uses goodput
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": total / elapsed if elapsed else 0.0,
+        "goodput_rps": (total - errors) / elapsed if elapsed else 0.0,
+        "p50_ms": _ms(percentile(latencies, 50)),
+        "p95_ms": _ms(percentile(latencies, 95)),
+        "p99_ms": _ms(percentile(latencies, 99)),
+        "error_rate": errors / total if total else 0.0,
+        "rejected_rate": rejected / total if total else 0.0,
+    }
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+def find_knee(levels, min_gain, max_error_rate):
+    """Last concurrency level before goodput grows by less than `min_gain` or errors exceed `max_error_rate`."""
+    if levels and levels[0]["error_rate"] > max_error_rate:
+        return levels[0]["concurrency"]
+    for current, following in zip(levels, levels[1:]):
+        if following["error_rate"] > max_error_rate:
+            return current["concurrency"]
+        if following["goodput_rps"] < current["goodput_rps"] * (1 + min_gain):
+            return current["concurrency"]
+    return None
+
+
+# ─── REPORTING ────────────────────────────────────────────────────────────────
+def print_table(result, max_error_rate):
+    print(f"\n{CYAN}{BOLD}{result['endpoint']}  mix={result['mix']}  "
+          f"workers={result['workers']}  threads={result['threads']}{RESET}")
+    print(f"{BOLD}{'conc':>5} {'reqs':>6} {'req/s':>8} {'good/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'err %':>7} {'rej %':>7}{RESET}")
+    for level in result["levels"]:
+        color = RED if level["error_rate"] > 0 else RESET
+        print(f"{color}{level['concurrency']:>5} {level['requests']:>6} {level['throughput_rps']:>8.2f} "
+              f"{level['goodput_rps']:>8.2f} {_fmt(level['p50_ms']):>9} {_fmt(level['p95_ms']):>9} {_fmt(level['p99_ms']):>9} "
+              f"{level['error_rate'] * 100:>7.1f} {level['rejected_rate'] * 100:>7.1f}{RESET}")
+
+    knee = result["knee_concurrency"]
+    if knee is None:
+        print(f"{YELLOW}   Knee    : not reached — goodput still scaling at the highest concurrency{RESET}")
+        return
+
+    level = next(level for level in result["levels"] if level["concurrency"] == knee)
+    if level["error_rate"] > max_error_rate:
+        print(f"{RED}   Knee    : none — error rate already {level['error_rate'] * 100:.1f}% "
+              f"at concurrency {knee}{RESET}")
+    else:
+        print(f"{GREEN}   Knee    : concurrency {knee} at {level['goodput_rps']:.2f} good req/s "
+              f"(p95 {_fmt(level['p95_ms'])} ms){RESET}")
+
+def _fmt(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def parse_int_list(text):
+    try:
+        values = [int(value) for value in text.split(",") if value]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma separated integers, got {text!r}")
+    if not values or min(values) < 1:
+        raise argparse.ArgumentTypeError(f"expected positive integers, got {text!r}")
+    return values
+
+def parse_env_pair(pair):
+    key, sep, value = pair.partition("=")
+    if not sep or not key:
+        raise argparse.ArgumentTypeError(f"expected KEY=VALUE, got {pair!r}")
+    return key, value
+
+def main():
+    parser = argparse.ArgumentParser(description="Closed-loop load test for /Verification and /predict.")
+    parser.add_argument("images", help="folder of .jpg/.jpeg/.heic test images")
+    parser.add_argument("--endpoint", choices=["verification", "predict", "both"], default="verification")
+    parser.add_argument("--workers", type=parse_int_list, default=[1], help="gunicorn worker counts, e.g. 1,2,4")
+    parser.add_argument("--threads", type=parse_int_list, default=[1], help="gunicorn threads per worker, e.g. 1,2")
+    parser.add_argument("--concurrency", type=parse_int_list, default=[1, 2, 4, 8], help="client counts, e.g. 1,2,4,8")
+    parser.add_argument("--mix", default="all", help="comma separated request mixes, e.g. all,jpeg,heic+fail")
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    parser.add_argument("--warmup", type=float, default=10.0, help="seconds of warmup per server start")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per request timeout in seconds")
+    parser.add_argument("--startup-timeout", type=float, default=300.0, help="seconds to wait for gunicorn")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="seconds the stub LLM waits before replying")
+    parser.add_argument("--large-kb", type=int, default=500, help="images at least this big are labelled large")
+    parser.add_argument("--knee-gain", type=float, default=0.10,
+                        help="goodput gain below which adding clients counts as saturated")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="error rate (5xx and failed requests) above which a level counts as saturated")
+    parser.add_argument("--env", action="append", default=[], type=parse_env_pair,
+                        help="extra server env var KEY=VALUE, repeatable")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", help="write all results to this file")
+    args = parser.parse_args()
+
+    print_banner()
+
+    images = load_images(args.images, args.large_kb)
+    if not images:
+        print(f"{RED}❌ No .jpg/.jpeg/.heic images found in {args.images}{RESET}\n")
+        sys.exit(1)
+
+    mixes = {}
+    for mix in args.mix.split(","):
+        selected = select_mix(images, mix)
+        if selected:
+            mixes[mix] = selected
+        else:
+            print(f"{YELLOW}⚠️  Mix '{mix}' matches no images, skipping.{RESET}")
+    if not mixes:
+        sys.exit(1)
+
+    endpoints = ["verification", "predict"] if args.endpoint == "both" else [args.endpoint]
+    extra_env = dict(args.env)
+    concurrency = sorted(set(args.concurrency))
+
+    llm = start_stub_llm(args.llm_latency)
+    llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+
+    print(f"{BOLD}📸 Images      : {len(images)} from {args.images}{RESET}")
+    print(f"{BOLD}🔀 Mixes       : {', '.join(f'{name} ({len(selected)})' for name, selected in mixes.items())}{RESET}")
+    print(f"{BOLD}🤖 Stub LLM    : {llm_url}{RESET}")
+    print(f"{BOLD}📈 Concurrency : {concurrency}{RESET}")
+
+    results = []
+    try:
+        for endpoint in endpoints:
+            for workers in args.workers:
+                for threads in args.threads:
+                    print(f"\nStarting {endpoint} with {workers} worker(s) x {threads} thread(s)...")
+                    try:
+                        process, url, workdir = start_server(endpoint, workers, threads, llm_url,
+                                                    extra_env, args.startup_timeout)
+                    except RuntimeError as e:
+                        print(f"{RED}❌ {e}{RESET}")
+                        continue
+
+                    try:
+                        warm_images = [image for selected in mixes.values() for image in selected]
+                        run_level(url, endpoint, warm_images, max(concurrency), args.warmup,
+                                  args.timeout, args.seed)
+
+                        for mix, selected in mixes.items():
+                            levels = [
+                                run_level(url, endpoint, selected, level, args.duration,
+                                          args.timeout, args.seed)
+                                for level in concurrency
+                            ]
+                            result = {
+                                "endpoint": endpoint,
+                                "mix": mix,
+                                "workers": workers,
+                                "threads": threads,
+                                "env": extra_env,
+                                "levels": levels,
+                                "knee_concurrency": find_knee(levels, args.knee_gain, args.max_error_rate),
+                            }
+                            results.append(result)
+                            print_table(result, args.max_error_rate)
+                    finally:
+                        stop_server(process, workdir)
+    finally:
+        llm.shutdown()
+
+    if args.json_path:
+        with open(args.json_path, "w") as file:
+            json.dump(results, file, indent=2)
+        print(f"\n{BOLD}💾 Results written to {args.json_path}{RESET}")
+
+    print(f"\n{BLUE}{'='*50}{RESET}\n")
+
+
+if __name__ == "__main__":
+    main()